@@ -1,18 +1,28 @@
+import os
+from dataclasses import dataclass
 from functools import lru_cache
-from pydantic import Field
-from pydantic_settings import BaseSettings
 from typing import List
 
-class Settings(BaseSettings):
-    openai_base_url: str = Field(default="http://localhost:1234/v1", alias="OPENAI_BASE_URL")
-    openai_api_key: str = Field(default="lm-studio", alias="OPENAI_API_KEY")
-    host: str = Field(default="127.0.0.1", alias="HOST")
-    port: int = Field(default=8000, alias="PORT")
-    cors_origins: str = Field(default="*", alias="CORS_ORIGINS")
-    default_regular_model: str = Field(default="qwen/qwen3-4b-2507", alias="DEFAULT_REGULAR_MODEL")
-    default_vision_model: str = Field(default="qwen3-vl-4b-instruct", alias="DEFAULT_VISION_MODEL")
+from dotenv import load_dotenv
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Application settings, read once from the environment (.env supported).
+
+    A plain frozen dataclass instead of pydantic BaseSettings: the instance is
+    built exactly once via get_settings, so the pydantic-settings machinery
+    (schema build, pydantic-core env parsing) was pure startup cost.
+    """
+    openai_base_url: str
+    openai_api_key: str
+    host: str
+    port: int
+    cors_origins: str
+    default_regular_model: str
+    default_vision_model: str
     # Timeout for LLM requests (connect timeout, read timeout for streaming)
-    llm_timeout: float = Field(default=300.0, alias="LLM_TIMEOUT")
+    llm_timeout: float
 
     @property
     def cors_origin_list(self) -> List[str]:
@@ -20,10 +30,20 @@ class Settings(BaseSettings):
             return ["*"]
         return [o.strip() for o in self.cors_origins.split(",") if o.strip()]
 
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
 
 @lru_cache
 def get_settings() -> Settings:
-    return Settings()
+    # .env is loaded lazily on first use rather than at import; existing
+    # environment variables take precedence, same as BaseSettings did.
+    load_dotenv()
+    env = os.environ.get
+    return Settings(
+        openai_base_url=env("OPENAI_BASE_URL", "http://localhost:1234/v1"),
+        openai_api_key=env("OPENAI_API_KEY", "lm-studio"),
+        host=env("HOST", "127.0.0.1"),
+        port=int(env("PORT", "8000")),
+        cors_origins=env("CORS_ORIGINS", "*"),
+        default_regular_model=env("DEFAULT_REGULAR_MODEL", "qwen/qwen3-4b-2507"),
+        default_vision_model=env("DEFAULT_VISION_MODEL", "qwen3-vl-4b-instruct"),
+        llm_timeout=float(env("LLM_TIMEOUT", "300")),
+    )
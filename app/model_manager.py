@@ -1,94 +1,117 @@
 """
 Model management using LM Studio SDK.
-Handles loading/unloading models while chat operations use OpenAI SDK.
+Handles loading/unloading models while chat operations use OpenAI-compatible API.
 """
+import asyncio
 import lmstudio as lms
-from typing import Optional
+from typing import Any, Optional
 
 class ModelNotAvailable(Exception):
     pass
 
 
+# Model handles resolved by the SDK, keyed by model key. lms.llm() performs a
+# lookup/handshake round-trip, so reuse handles we already have instead of
+# re-resolving on every unload.
+_HANDLE_CACHE: dict[str, Any] = {}
+
+
 class ModelManager:
     """Simplified model manager for loading/unloading models via LM Studio SDK."""
-    
+
     @staticmethod
-    def list_models() -> list[dict]:
+    async def list_models() -> list[dict]:
         """List all loaded models."""
         try:
-            models = lms.list_loaded_models("llm")
+            models = await asyncio.to_thread(lms.list_loaded_models, "llm")
         except Exception as e:
             raise ModelNotAvailable(f"Could not connect to LM Studio: {e}")
-        
+
+        # get_info() is a synchronous SDK round-trip per model; run them
+        # concurrently so N models cost one round-trip of latency, not N.
+        infos = await asyncio.gather(
+            *(asyncio.to_thread(model.get_info) for model in models),
+            return_exceptions=True,
+        )
+
         result = []
-        for model in models:
-            try:
-                info = model.get_info()
-                model_key = getattr(info, "modelKey", None)
-                display_name = getattr(info, "displayName", None)
-                
-                if not model_key:
-                    continue
-                
-                result.append({
-                    "key": model_key,
-                    "display_name": display_name or model_key,
-                })
-            except Exception:
+        for model, info in zip(models, infos):
+            if isinstance(info, BaseException):
+                continue
+            model_key = getattr(info, "modelKey", None)
+            display_name = getattr(info, "displayName", None)
+
+            if not model_key:
                 continue
-        
+
+            _HANDLE_CACHE[model_key] = model
+            result.append({
+                "key": model_key,
+                "display_name": display_name or model_key,
+            })
+
         return result
-    
+
     @staticmethod
-    def load_model(model_key: str, exclusive: bool = False) -> dict:
+    async def load_model(model_key: str, exclusive: bool = False) -> dict:
         """Load a model. If exclusive=True, unload others first."""
         try:
             if exclusive:
-                ModelManager.unload_all()
-            
+                await ModelManager.unload_all()
+
             # Load the model using LM Studio SDK
-            model = lms.llm(model_key)
-            
+            model = await asyncio.to_thread(lms.llm, model_key)
+            _HANDLE_CACHE[model_key] = model
+
             # Get model info
             try:
-                info = model.get_info()
+                info = await asyncio.to_thread(model.get_info)
                 display_name = getattr(info, "displayName", model_key)
             except Exception:
                 display_name = model_key
-            
+
             return {
                 "key": model_key,
                 "display_name": display_name,
             }
         except Exception as e:
             raise ModelNotAvailable(f"Failed to load model {model_key}: {e}")
-    
+
     @staticmethod
-    def unload_model(model_key: str) -> bool:
+    async def unload_model(model_key: str) -> bool:
         """Unload a specific model."""
         try:
-            model = lms.llm(model_key)
-            model.unload()
+            model = _HANDLE_CACHE.get(model_key)
+            if model is None:
+                model = await asyncio.to_thread(lms.llm, model_key)
+            await asyncio.to_thread(model.unload)
+            _HANDLE_CACHE.pop(model_key, None)
             return True
         except Exception as e:
+            # Evict on failure too: a cached handle may be dead (e.g. LM
+            # Studio restarted) and keeping it would make every retry fail
+            # until something repopulated the cache. The next attempt
+            # re-resolves via lms.llm.
+            _HANDLE_CACHE.pop(model_key, None)
             raise ModelNotAvailable(f"Failed to unload model {model_key}: {e}")
-    
+
     @staticmethod
-    def unload_all() -> list[str]:
+    async def unload_all() -> list[str]:
         """Unload all loaded models."""
         unloaded = []
         try:
-            models = lms.list_loaded_models("llm")
+            models = await asyncio.to_thread(lms.list_loaded_models, "llm")
             for model in models:
                 try:
-                    info = model.get_info()
+                    info = await asyncio.to_thread(model.get_info)
                     key = getattr(info, "modelKey", None)
-                    model.unload()
+                    await asyncio.to_thread(model.unload)
                     if key:
                         unloaded.append(key)
+                        _HANDLE_CACHE.pop(key, None)
                 except Exception:
                     continue
         except Exception:
             pass
-        
+
         return unloaded
@@ -1,125 +1,172 @@
-import json
 import time
 import logging
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
-from ..schemas import ChatRequest, StreamChatRequest, ChatResponse, RegularChatRequest, VisionChatRequest, StreamRegularChatRequest, StreamVisionChatRequest
+import msgspec
+import orjson
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+from .. import schemas
+from ..schemas_fast import ChatRequest, RegularChatRequest, VisionChatRequest
 from ..services import respond, stream_respond, respond_regular, stream_respond_regular, respond_vision, stream_respond_vision
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
-@router.post("", response_model=ChatResponse)
-async def chat(req: ChatRequest):
+# Precompiled msgspec decoders: JSON decode + shape validation happen in C in
+# a single pass over the body, instead of dict -> pydantic-core -> model_dump.
+_CHAT_DECODER = msgspec.json.Decoder(ChatRequest)
+_REGULAR_DECODER = msgspec.json.Decoder(RegularChatRequest)
+_VISION_DECODER = msgspec.json.Decoder(VisionChatRequest)
+
+# Bodies above this size are sent as chunked StreamingResponse slices so a
+# single multi-hundred-KB completion doesn't go out as one giant socket write
+# that blocks the event loop; smaller bodies go out in a single frame.
+_STREAM_THRESHOLD = 64 * 1024
+_STREAM_CHUNK = 64 * 1024
+
+
+def _json_response(data: dict):
+    """Serialize a completed chat payload, chunk-streaming it when large."""
+    body = orjson.dumps(data)
+    if len(body) <= _STREAM_THRESHOLD:
+        return Response(content=body, media_type="application/json")
+
+    async def chunks():
+        for i in range(0, len(body), _STREAM_CHUNK):
+            yield body[i:i + _STREAM_CHUNK]
+
+    return StreamingResponse(chunks(), media_type="application/json")
+
+
+def _body_doc(model) -> dict:
+    """OpenAPI requestBody for routes that parse their bodies with msgspec.
+
+    Taking the raw Request removes the body from FastAPI's docgen, so the
+    pydantic request models in schemas.py are wired back in here.
+    """
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": model.model_json_schema()}},
+        }
+    }
+
+
+def _stream_response(source, sse: bool, perf: bool, request_start: float):
+    """Wrap an async item source as NDJSON (default) or SSE when requested."""
+    if sse:
+        async def event_gen():
+            async for item in source:
+                yield b"data: " + orjson.dumps(item) + b"\n\n"
+            if perf:
+                logger.debug(f"[PERF] === Stream completed: {(time.perf_counter() - request_start)*1000:.2f}ms ===")
+
+        return StreamingResponse(event_gen(), media_type="text/event-stream")
+
+    async def event_gen():
+        async for item in source:
+            yield orjson.dumps(item) + b"\n"
+        if perf:
+            logger.debug(f"[PERF] === Stream completed: {(time.perf_counter() - request_start)*1000:.2f}ms ===")
+
+    return StreamingResponse(event_gen(), media_type="application/x-ndjson")
+
+
+def _decode_body(body: bytes, decoder: msgspec.json.Decoder):
+    """Decode a request body into (struct, messages, config), 422 on bad input."""
+    try:
+        req = decoder.decode(body)
+    except (msgspec.DecodeError, msgspec.ValidationError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    messages = msgspec.to_builtins(req.messages)
+    config = None
+    if req.config is not None:
+        config = {k: v for k, v in msgspec.structs.asdict(req.config).items() if v is not None}
+    return req, messages, config
+
+
+@router.post("", openapi_extra=_body_doc(schemas.ChatRequest))
+async def chat(request: Request):
     """Generic chat endpoint with custom model selection."""
-    request_start = time.perf_counter()
-    logger.info("[PERF] === Chat request received ===")
-    
+    # [PERF] instrumentation only runs when DEBUG logging is enabled
+    perf = logger.isEnabledFor(logging.DEBUG)
+    request_start = time.perf_counter() if perf else 0.0
+
+    req, messages, config = _decode_body(await request.body(), _CHAT_DECODER)
+    if perf:
+        logger.debug(f"[PERF] Request parsing: {(time.perf_counter() - request_start)*1000:.2f}ms")
+
     try:
-        t0 = time.perf_counter()
-        messages = [m.model_dump() for m in req.messages]
-        config = req.config.model_dump(exclude_none=True) if req.config else None
-        logger.info(f"[PERF] Request parsing: {(time.perf_counter() - t0)*1000:.2f}ms")
-        
-        t0 = time.perf_counter()
         data = await respond(messages, req.model_key, config)
-        logger.info(f"[PERF] respond() call: {(time.perf_counter() - t0)*1000:.2f}ms")
-    except Exception as e:
-        raise HTTPException(status_code=503, detail=f"Chat service unavailable: {e}")
-    
-    logger.info(f"[PERF] === Total request time: {(time.perf_counter() - request_start)*1000:.2f}ms ===")
-    return ChatResponse(**data)
-
-@router.post("/stream")
-async def chat_stream(req: StreamChatRequest):
-    """Generic streaming chat endpoint with custom model selection."""
-    request_start = time.perf_counter()
-    logger.info("[PERF] === Stream chat request received ===")
-    
-    try:
-        messages = [m.model_dump() for m in req.messages]
-        config = req.config.model_dump(exclude_none=True) if req.config else None
     except Exception as e:
         raise HTTPException(status_code=503, detail=f"Chat service unavailable: {e}")
 
-    async def event_gen():
-        async for item in stream_respond(messages, req.model_key, config):
-            yield json.dumps(item) + "\n"
-        logger.info(f"[PERF] === Stream completed: {(time.perf_counter() - request_start)*1000:.2f}ms ===")
+    if perf:
+        logger.debug(f"[PERF] === Total request time: {(time.perf_counter() - request_start)*1000:.2f}ms ===")
+    return _json_response(data)
 
-    return StreamingResponse(event_gen(), media_type="application/x-ndjson")
+@router.post("/stream", openapi_extra=_body_doc(schemas.StreamChatRequest))
+async def chat_stream(request: Request, sse: bool = False):
+    """Generic streaming chat endpoint with custom model selection (NDJSON, or SSE with ?sse=true)."""
+    perf = logger.isEnabledFor(logging.DEBUG)
+    request_start = time.perf_counter() if perf else 0.0
+
+    req, messages, config = _decode_body(await request.body(), _CHAT_DECODER)
+    return _stream_response(stream_respond(messages, req.model_key, config), sse, perf, request_start)
 
 
-@router.post("/regular", response_model=ChatResponse)
-async def chat_regular(req: RegularChatRequest):
+@router.post("/regular", openapi_extra=_body_doc(schemas.RegularChatRequest))
+async def chat_regular(request: Request):
     """Chat endpoint for regular text-only tasks using the default regular model."""
-    request_start = time.perf_counter()
-    logger.info("[PERF] === Regular chat request received ===")
-    
+    perf = logger.isEnabledFor(logging.DEBUG)
+    request_start = time.perf_counter() if perf else 0.0
+
+    _, messages, config = _decode_body(await request.body(), _REGULAR_DECODER)
+
     try:
-        messages = [m.model_dump() for m in req.messages]
-        config = req.config.model_dump(exclude_none=True) if req.config else None
         data = await respond_regular(messages, config)
     except Exception as e:
         raise HTTPException(status_code=503, detail=f"Chat service unavailable: {e}")
-    
-    logger.info(f"[PERF] === Total request time: {(time.perf_counter() - request_start)*1000:.2f}ms ===")
-    return ChatResponse(**data)
 
+    if perf:
+        logger.debug(f"[PERF] === Total request time: {(time.perf_counter() - request_start)*1000:.2f}ms ===")
+    return _json_response(data)
 
-@router.post("/regular/stream")
-async def chat_regular_stream(req: StreamRegularChatRequest):
-    """Streaming chat endpoint for regular text-only tasks using the default regular model."""
-    request_start = time.perf_counter()
-    logger.info("[PERF] === Regular stream request received ===")
-    
-    try:
-        messages = [m.model_dump() for m in req.messages]
-        config = req.config.model_dump(exclude_none=True) if req.config else None
-    except Exception as e:
-        raise HTTPException(status_code=503, detail=f"Chat service unavailable: {e}")
 
-    async def event_gen():
-        async for item in stream_respond_regular(messages, config):
-            yield json.dumps(item) + "\n"
-        logger.info(f"[PERF] === Stream completed: {(time.perf_counter() - request_start)*1000:.2f}ms ===")
+@router.post("/regular/stream", openapi_extra=_body_doc(schemas.StreamRegularChatRequest))
+async def chat_regular_stream(request: Request, sse: bool = False):
+    """Streaming chat endpoint for regular text-only tasks using the default regular model."""
+    perf = logger.isEnabledFor(logging.DEBUG)
+    request_start = time.perf_counter() if perf else 0.0
 
-    return StreamingResponse(event_gen(), media_type="application/x-ndjson")
+    _, messages, config = _decode_body(await request.body(), _REGULAR_DECODER)
+    return _stream_response(stream_respond_regular(messages, config), sse, perf, request_start)
 
 
-@router.post("/vision", response_model=ChatResponse)
-async def chat_vision(req: VisionChatRequest):
+@router.post("/vision", openapi_extra=_body_doc(schemas.VisionChatRequest))
+async def chat_vision(request: Request):
     """Chat endpoint for visual tasks using the default vision model."""
-    request_start = time.perf_counter()
-    logger.info("[PERF] === Vision chat request received ===")
-    
+    perf = logger.isEnabledFor(logging.DEBUG)
+    request_start = time.perf_counter() if perf else 0.0
+
+    _, messages, config = _decode_body(await request.body(), _VISION_DECODER)
+
     try:
-        messages = [m.model_dump() for m in req.messages]
-        config = req.config.model_dump(exclude_none=True) if req.config else None
         data = await respond_vision(messages, config)
     except Exception as e:
         raise HTTPException(status_code=503, detail=f"Chat service unavailable: {e}")
-    
-    logger.info(f"[PERF] === Total request time: {(time.perf_counter() - request_start)*1000:.2f}ms ===")
-    return ChatResponse(**data)
 
+    if perf:
+        logger.debug(f"[PERF] === Total request time: {(time.perf_counter() - request_start)*1000:.2f}ms ===")
+    return _json_response(data)
 
-@router.post("/vision/stream")
-async def chat_vision_stream(req: StreamVisionChatRequest):
-    """Streaming chat endpoint for visual tasks using the default vision model."""
-    request_start = time.perf_counter()
-    logger.info("[PERF] === Vision stream request received ===")
-    
-    try:
-        messages = [m.model_dump() for m in req.messages]
-        config = req.config.model_dump(exclude_none=True) if req.config else None
-    except Exception as e:
-        raise HTTPException(status_code=503, detail=f"Chat service unavailable: {e}")
 
-    async def event_gen():
-        async for item in stream_respond_vision(messages, config):
-            yield json.dumps(item) + "\n"
-        logger.info(f"[PERF] === Stream completed: {(time.perf_counter() - request_start)*1000:.2f}ms ===")
+@router.post("/vision/stream", openapi_extra=_body_doc(schemas.StreamVisionChatRequest))
+async def chat_vision_stream(request: Request, sse: bool = False):
+    """Streaming chat endpoint for visual tasks using the default vision model."""
+    perf = logger.isEnabledFor(logging.DEBUG)
+    request_start = time.perf_counter() if perf else 0.0
 
-    return StreamingResponse(event_gen(), media_type="application/x-ndjson")
+    _, messages, config = _decode_body(await request.body(), _VISION_DECODER)
+    return _stream_response(stream_respond_vision(messages, config), sse, perf, request_start)
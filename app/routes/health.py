@@ -1,8 +1,13 @@
+import orjson
 from fastapi import APIRouter
+from fastapi.responses import Response
 from ..schemas import HealthResponse
 
 router = APIRouter(prefix="/health", tags=["health"])
 
+# The health payload never changes; pre-encode it once.
+_HEALTH_BYTES = orjson.dumps(HealthResponse.model_construct(status="ok").model_dump())
+
 @router.get("", response_model=HealthResponse)
-async def health() -> HealthResponse:
-    return HealthResponse(status="ok")
+async def health():
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
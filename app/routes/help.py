@@ -1,9 +1,11 @@
+import orjson
 from fastapi import APIRouter
+from fastapi.responses import Response
 
 router = APIRouter(prefix="/help", tags=["help"])
 
 HELP_TEXT = {
-    "summary": "LM Studio FastAPI endpoints (OpenAI SDK for chat + LM Studio SDK for model management)",
+    "summary": "LM Studio FastAPI endpoints (OpenAI-compatible API for chat + LM Studio SDK for model management)",
     "routes": [
         {
             "method": "GET",
@@ -58,8 +60,8 @@ HELP_TEXT = {
     ],
     "notes": [
         "Model management (load/unload) uses LM Studio SDK",
-        "Chat operations use OpenAI SDK with LM Studio's OpenAI-compatible API (http://localhost:1234/v1)",
-        "Models are loaded/unloaded via LM Studio SDK but chat goes through OpenAI endpoint",
+        "Chat operations call LM Studio's OpenAI-compatible API directly via httpx (http://localhost:1234/v1)",
+        "Models are loaded/unloaded via LM Studio SDK but chat goes through the OpenAI-compatible endpoint",
         "messages[].role is one of system|user|assistant",
         "messages[].images[] accepts { data_base64, mime_type? } for vision models (VLM)",
         "Images use data URL format: data:image/jpeg;base64,{base64_string}",
@@ -67,10 +69,16 @@ HELP_TEXT = {
         "config supports: temperature, maxTokens, topP, presencePenalty, frequencyPenalty",
         "Default models configured in .env: DEFAULT_REGULAR_MODEL, DEFAULT_VISION_MODEL",
         "Streaming returns application/x-ndjson with one JSON object per line",
+        "Streaming endpoints accept ?sse=true to emit Server-Sent Events (text/event-stream) instead of NDJSON",
         "Use exclusive=true when loading to unload other models first"
     ]
 }
 
+# HELP_TEXT is constant, so serialize it once at import and send the
+# pre-encoded bytes straight into the response buffer on every request.
+_HELP_BYTES = orjson.dumps(HELP_TEXT)
+
+
 @router.get("")
 async def get_help():
-    return HELP_TEXT
+    return Response(content=_HELP_BYTES, media_type="application/json")
@@ -0,0 +1,45 @@
+"""
+msgspec mirrors of the chat request schemas in schemas.py.
+
+msgspec decodes JSON and validates the struct shape in C in a single pass --
+no intermediate dict and no pydantic-core schema walk -- which matters for
+chat bodies carrying large base64 images. The pydantic models in schemas.py
+remain the source of truth for OpenAPI documentation.
+"""
+from typing import Optional
+
+import msgspec
+
+
+class ChatImage(msgspec.Struct):
+    data_base64: str
+    mime_type: Optional[str] = "image/jpeg"
+
+
+class ChatMessage(msgspec.Struct):
+    role: str
+    content: str = ""
+    images: list[ChatImage] = []
+
+
+class ChatConfig(msgspec.Struct):
+    temperature: Optional[float] = None
+    maxTokens: Optional[int] = None
+    topP: Optional[float] = None
+    presencePenalty: Optional[float] = None
+    frequencyPenalty: Optional[float] = None
+
+
+class ChatRequest(msgspec.Struct):
+    messages: list[ChatMessage]
+    model_key: Optional[str] = None
+    config: Optional[ChatConfig] = None
+
+
+class RegularChatRequest(msgspec.Struct):
+    messages: list[ChatMessage]
+    config: Optional[ChatConfig] = None
+
+
+class VisionChatRequest(RegularChatRequest):
+    pass
@@ -3,17 +3,20 @@ from functools import lru_cache
 import time
 import logging
 import httpx
-from openai import AsyncOpenAI
+import orjson
 
 from .config import get_settings
 
-# Setup logging for performance tracking
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 @lru_cache
-def get_client() -> AsyncOpenAI:
-    """Get configured async OpenAI client for LM Studio (cached singleton)."""
+def get_client() -> httpx.AsyncClient:
+    """Get async httpx client for LM Studio's OpenAI-compatible API (cached singleton).
+
+    Talks to /chat/completions directly and parses bodies with orjson, which
+    skips the openai SDK's pydantic wrapping (re-validated per streamed chunk)
+    and its stdlib-json parsing of every SSE line.
+    """
     start = time.perf_counter()
     settings = get_settings()
     # Use httpx.Timeout for granular control:
@@ -27,27 +30,52 @@ def get_client() -> AsyncOpenAI:
         write=30.0,
         pool=10.0,
     )
-    client = AsyncOpenAI(
+    # HTTP/2 multiplexes concurrent chat streams over one connection to LM
+    # Studio (no HTTP/1.1 head-of-line blocking between long-running streams);
+    # httpx falls back to HTTP/1.1 if the server doesn't negotiate it. The
+    # raised limits keep bursts of concurrent requests from queueing on the
+    # default ~10-connection pool.
+    client = httpx.AsyncClient(
         base_url=settings.openai_base_url,
-        api_key=settings.openai_api_key,
+        headers={
+            "Authorization": f"Bearer {settings.openai_api_key}",
+            "Content-Type": "application/json",
+        },
+        http2=True,
+        limits=httpx.Limits(max_connections=256, max_keepalive_connections=64),
         timeout=timeout,
     )
-    logger.info(f"[PERF] Client created in {(time.perf_counter() - start)*1000:.2f}ms")
+    logger.debug(f"[PERF] Client created in {(time.perf_counter() - start)*1000:.2f}ms")
     return client
 
 
+# Default models resolved once at import: avoids a get_settings() call plus
+# pydantic __getattr__ machinery on every request in the respond* hot paths.
+DEFAULT_REGULAR_MODEL = get_settings().default_regular_model
+DEFAULT_VISION_MODEL = get_settings().default_vision_model
+
+# Maps our config keys to OpenAI parameter names (ours, openai)
+_CONFIG_KEY_MAP = (
+    ("temperature", "temperature"),
+    ("maxTokens", "max_tokens"),
+    ("topP", "top_p"),
+    ("presencePenalty", "presence_penalty"),
+    ("frequencyPenalty", "frequency_penalty"),
+)
+
+
 def build_messages(messages: list[dict]) -> list[dict]:
     """
     Build OpenAI-compatible messages from request payload.
     Handles image preparation for VLM (Vision-Language Model) inputs.
     """
     formatted_messages = []
-    
+
     for msg in messages:
         role = msg.get("role", "user")
         content = msg.get("content", "")
         images = msg.get("images", []) or []
-        
+
         if not images:
             # Text-only message
             formatted_messages.append({
@@ -57,158 +85,167 @@ def build_messages(messages: list[dict]) -> list[dict]:
         else:
             # Message with images (for vision models)
             content_parts = []
-            
+
             # Add text content
             if content:
                 content_parts.append({
                     "type": "text",
                     "text": content
                 })
-            
+
             # Add images
             for img in images:
                 b64 = img.get("data_base64")
-                mime_type = img.get("mime_type", "image/jpeg")
+                # mime_type is Optional in the schemas, so an explicit null
+                # must fall back to the default too
+                mime_type = img.get("mime_type") or "image/jpeg"
                 if b64:
-                    # OpenAI format: data URL with base64 image
+                    # OpenAI format: data URL with base64 image.
+                    # join() builds the (potentially multi-MB) data URL in one
+                    # allocation instead of going through f-string formatting.
                     content_parts.append({
                         "type": "image_url",
                         "image_url": {
-                            "url": f"data:{mime_type};base64,{b64}"
+                            "url": "".join(("data:", mime_type, ";base64,", b64))
                         }
                     })
-            
+
             formatted_messages.append({
                 "role": role,
                 "content": content_parts
             })
-    
+
     return formatted_messages
 
 
 async def respond(messages: list[dict], model_key: Optional[str], config: Optional[dict]) -> dict:
     """Non-streaming chat completion (async)."""
-    total_start = time.perf_counter()
-    
-    t0 = time.perf_counter()
-    settings = get_settings()
-    logger.info(f"[PERF] get_settings: {(time.perf_counter() - t0)*1000:.2f}ms")
-    
-    t0 = time.perf_counter()
+    # [PERF] instrumentation only pays its cost (perf_counter + f-string
+    # formatting) when DEBUG logging is enabled.
+    perf = logger.isEnabledFor(logging.DEBUG)
+    total_start = time.perf_counter() if perf else 0.0
+
     client = get_client()
-    logger.info(f"[PERF] get_client: {(time.perf_counter() - t0)*1000:.2f}ms")
-    
+
     # Use provided model or default
-    model = model_key or settings.default_regular_model
-    
+    model = model_key or DEFAULT_REGULAR_MODEL
+
     # Build messages
-    t0 = time.perf_counter()
     formatted_messages = build_messages(messages)
-    logger.info(f"[PERF] build_messages: {(time.perf_counter() - t0)*1000:.2f}ms")
-    
+
     # Prepare config
-    cfg = config or {}
     params = {
         "model": model,
         "messages": formatted_messages,
     }
-    
+
     # Map our config to OpenAI parameters
-    if "temperature" in cfg:
-        params["temperature"] = cfg["temperature"]
-    if "maxTokens" in cfg:
-        params["max_tokens"] = cfg["maxTokens"]
-    if "topP" in cfg:
-        params["top_p"] = cfg["topP"]
-    if "presencePenalty" in cfg:
-        params["presence_penalty"] = cfg["presencePenalty"]
-    if "frequencyPenalty" in cfg:
-        params["frequency_penalty"] = cfg["frequencyPenalty"]
-    
+    if config:
+        params.update({oai: config[ours] for ours, oai in _CONFIG_KEY_MAP if ours in config})
+
     # Make async API call
-    t0 = time.perf_counter()
-    logger.info(f"[PERF] Calling LLM API with model: {model}")
-    response = await client.chat.completions.create(**params)
-    logger.info(f"[PERF] LLM API response: {(time.perf_counter() - t0)*1000:.2f}ms")
-    
-    logger.info(f"[PERF] Total respond(): {(time.perf_counter() - total_start)*1000:.2f}ms")
-    
+    t0 = 0.0
+    if perf:
+        logger.debug(f"[PERF] respond() setup: {(time.perf_counter() - total_start)*1000:.2f}ms, model: {model}")
+        t0 = time.perf_counter()
+    response = await client.post("/chat/completions", content=orjson.dumps(params))
+    response.raise_for_status()
+    data = orjson.loads(response.content)
+    if perf:
+        now = time.perf_counter()
+        logger.debug(f"[PERF] LLM API response: {(now - t0)*1000:.2f}ms, total respond(): {(now - total_start)*1000:.2f}ms")
+
+    choice = data["choices"][0]
+    usage = data.get("usage")
     return {
-        "model": response.model,
-        "content": response.choices[0].message.content,
-        "stop_reason": response.choices[0].finish_reason,
-        "predicted_tokens": response.usage.completion_tokens if response.usage else None,
+        "model": data.get("model") or model,
+        "content": choice["message"]["content"],
+        "stop_reason": choice.get("finish_reason"),
+        "predicted_tokens": usage.get("completion_tokens") if usage else None,
     }
 
 
 async def stream_respond(messages: list[dict], model_key: Optional[str], config: Optional[dict]) -> AsyncIterable[dict]:
-    """Streaming chat completion (async generator)."""
-    total_start = time.perf_counter()
-    
-    settings = get_settings()
+    """Streaming chat completion (async generator).
+
+    Fragment dicts are reused between yields: consumers must serialize (or
+    copy) each item before advancing the generator, which is what the NDJSON/
+    SSE encoders in the chat routes do.
+    """
+    perf = logger.isEnabledFor(logging.DEBUG)
+    total_start = time.perf_counter() if perf else 0.0
+
     client = get_client()
-    
+
     # Use provided model or default
-    model = model_key or settings.default_regular_model
-    
+    model = model_key or DEFAULT_REGULAR_MODEL
+
     # Build messages
     formatted_messages = build_messages(messages)
-    
+
     # Prepare config
-    cfg = config or {}
     params = {
         "model": model,
         "messages": formatted_messages,
         "stream": True,
     }
-    
+
     # Map our config to OpenAI parameters
-    if "temperature" in cfg:
-        params["temperature"] = cfg["temperature"]
-    if "maxTokens" in cfg:
-        params["max_tokens"] = cfg["maxTokens"]
-    if "topP" in cfg:
-        params["top_p"] = cfg["topP"]
-    if "presencePenalty" in cfg:
-        params["presence_penalty"] = cfg["presencePenalty"]
-    if "frequencyPenalty" in cfg:
-        params["frequency_penalty"] = cfg["frequencyPenalty"]
-    
+    if config:
+        params.update({oai: config[ours] for ours, oai in _CONFIG_KEY_MAP if ours in config})
+
     # Make async streaming API call
-    logger.info(f"[PERF] stream_respond setup: {(time.perf_counter() - total_start)*1000:.2f}ms")
-    t0 = time.perf_counter()
-    stream = await client.chat.completions.create(**params)
-    logger.info(f"[PERF] LLM stream created: {(time.perf_counter() - t0)*1000:.2f}ms")
-    
+    t0 = 0.0
+    if perf:
+        logger.debug(f"[PERF] stream_respond setup: {(time.perf_counter() - total_start)*1000:.2f}ms")
+        t0 = time.perf_counter()
+
     model_name = None
     total_tokens = 0
     finish_reason = None
-    first_token_time = None
-    
-    async for chunk in stream:
-        if first_token_time is None:
-            first_token_time = time.perf_counter()
-            logger.info(f"[PERF] Time to first token: {(first_token_time - total_start)*1000:.2f}ms")
-        
-        if chunk.choices:
-            choice = chunk.choices[0]
-            
-            # Get model name from first chunk
-            if model_name is None and chunk.model:
-                model_name = chunk.model
-            
-            # Get content delta
-            if choice.delta and choice.delta.content:
-                yield {
-                    "type": "fragment",
-                    "content": choice.delta.content
-                }
-                total_tokens += 1
-            
-            # Get finish reason
-            if choice.finish_reason:
-                finish_reason = choice.finish_reason
-    
+    # Prebuilt fragment template mutated in place per token (see docstring);
+    # saves one dict allocation per fragment over thousands of tokens.
+    fragment = {"type": "fragment", "content": None}
+
+    async with client.stream("POST", "/chat/completions", content=orjson.dumps(params)) as response:
+        response.raise_for_status()
+        if perf:
+            logger.debug(f"[PERF] LLM stream created: {(time.perf_counter() - t0)*1000:.2f}ms")
+
+        # Parse SSE lines ourselves: each chunk is a plain dict decoded by
+        # orjson, with no per-chunk pydantic model construction.
+        async for line in response.aiter_lines():
+            if not line.startswith("data: "):
+                continue
+            payload = line[6:]
+            if payload == "[DONE]":
+                break
+            chunk = orjson.loads(payload)
+
+            choices = chunk.get("choices")
+            if choices:
+                choice = choices[0]
+
+                # Get model name from first chunk
+                if model_name is None and chunk.get("model"):
+                    model_name = chunk["model"]
+
+                # Get content delta
+                delta = choice.get("delta")
+                content = delta.get("content") if delta else None
+                if content:
+                    # TTFT is measured on the first fragment; the check is two
+                    # local comparisons, nothing when DEBUG is off.
+                    if perf and total_tokens == 0:
+                        logger.debug(f"[PERF] Time to first token: {(time.perf_counter() - total_start)*1000:.2f}ms")
+                    fragment["content"] = content
+                    yield fragment
+                    total_tokens += 1
+
+                # Get finish reason
+                if choice.get("finish_reason"):
+                    finish_reason = choice["finish_reason"]
+
     # Yield final message
     yield {
         "type": "done",
@@ -220,29 +257,21 @@ async def stream_respond(messages: list[dict], model_key: Optional[str], config:
 
 async def respond_regular(messages: list[dict], config: Optional[dict]) -> dict:
     """Handle regular chat requests with default model for text-only tasks."""
-    settings = get_settings()
-    model_key = settings.default_regular_model
-    return await respond(messages, model_key, config)
+    return await respond(messages, DEFAULT_REGULAR_MODEL, config)
 
 
 async def stream_respond_regular(messages: list[dict], config: Optional[dict]) -> AsyncIterable[dict]:
     """Handle streaming regular chat requests with default model for text-only tasks."""
-    settings = get_settings()
-    model_key = settings.default_regular_model
-    async for item in stream_respond(messages, model_key, config):
+    async for item in stream_respond(messages, DEFAULT_REGULAR_MODEL, config):
         yield item
 
 
 async def respond_vision(messages: list[dict], config: Optional[dict]) -> dict:
     """Handle vision chat requests with default model for visual tasks."""
-    settings = get_settings()
-    model_key = settings.default_vision_model
-    return await respond(messages, model_key, config)
+    return await respond(messages, DEFAULT_VISION_MODEL, config)
 
 
 async def stream_respond_vision(messages: list[dict], config: Optional[dict]) -> AsyncIterable[dict]:
     """Handle streaming vision chat requests with default model for visual tasks."""
-    settings = get_settings()
-    model_key = settings.default_vision_model
-    async for item in stream_respond(messages, model_key, config):
+    async for item in stream_respond(messages, DEFAULT_VISION_MODEL, config):
         yield item
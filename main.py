@@ -1,6 +1,13 @@
+import logging
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from app.config import get_settings
+
+# Configure logging once at the application entrypoint; set DEBUG to see the
+# [PERF] instrumentation in the chat routes and services.
+logging.basicConfig(level=logging.INFO)
 from app.routes.health import router as health_router
 from app.routes.models import router as models_router
 from app.routes.chat import router as chat_router
@@ -8,7 +15,12 @@ from app.routes.help import router as help_router
 
 settings = get_settings()
 
-app = FastAPI(title="LM Studio FastAPI Service", version="0.1.0")
+# orjson serializes responses 3-10x faster than stdlib json (hot path: chat completions)
+app = FastAPI(
+    title="LM Studio FastAPI Service",
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
+)
 
 if settings.cors_origin_list:
     app.add_middleware(
@@ -31,4 +43,16 @@ async def root():
 # Entrypoint for running via `python main.py`
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host=settings.host, port=settings.port, reload=True)
+    # uvloop + httptools: C implementations of the event loop and HTTP
+    # parser, cutting per-request syscall/socket overhead on every route.
+    # loop="auto" picks uvloop where it's installed (the requirements pin
+    # skips it on Windows, which uvloop doesn't support) and falls back to
+    # asyncio elsewhere.
+    uvicorn.run(
+        "main:app",
+        host=settings.host,
+        port=settings.port,
+        reload=True,
+        loop="auto",
+        http="httptools",
+    )